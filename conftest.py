@@ -410,8 +410,10 @@ async def http_client():
     # FIXME: maybe re-scope to module, but would also need
     # adjusted event_loop scope. if we have many API tests
     # maybe reconsider.
+    connector = aiohttp.TCPConnector(limit_per_host=32, keepalive_timeout=75)
     async with aiohttp.ClientSession(
-        timeout=aiohttp.ClientTimeout(total=30)
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30),
     ) as session:
         yield session
 
@@ -424,11 +426,11 @@ def shared_state():
 class ServerThread(threading.Thread):
     def __init__(self, port, shared_state, *args, **kwargs):
         super().__init__(name='LiberTEM-background', *args, **kwargs)
-        self.stop_event = threading.Event()
         self.start_event = threading.Event()
         self.port = port
         self.shared_state = shared_state
         self.loop = None
+        self.stop_requested = None
 
     async def stop(self):
         self.server.stop()
@@ -439,14 +441,17 @@ class ServerThread(threading.Thread):
 
     async def wait_for_stop(self):
         """
-        background task to periodically check if the main thread wants
-        us to stop
+        background task that stops the server once the main thread
+        calls `request_stop`
         """
-        while True:
-            if self.stop_event.is_set():
-                await self.stop()
-                break
-            await asyncio.sleep(0.1)
+        await self.stop_requested.wait()
+        await self.stop()
+
+    def request_stop(self):
+        """
+        ask the server to stop, to be called from the main thread
+        """
+        self.loop.call_soon_threadsafe(self.stop_requested.set)
 
     def run(self):
         try:
@@ -460,6 +465,7 @@ class ServerThread(threading.Thread):
             self.server = app.listen(address="127.0.0.1", port=self.port)
             # self.shared_state.set_server(self.server)
 
+            self.stop_requested = asyncio.Event()
             asyncio.ensure_future(self.wait_for_stop())
             self.start_event.set()
             loop.run_forever()
@@ -480,7 +486,7 @@ def server_port(unused_tcp_port_factory, shared_state):
     assert thread.start_event.wait(timeout=1), "server thread failed to start"
     yield port
     print("stopping server at port {}".format(port))
-    thread.stop_event.set()
+    thread.request_stop()
     thread.join(timeout=15)
     if thread.is_alive():
         raise RuntimeError("thread did not stop in the given timeout")
@@ -491,6 +497,11 @@ async def base_url(server_port):
     return "http://127.0.0.1:%d" % server_port
 
 
+@pytest.fixture(scope="function")
+def ws_url(server_port):
+    return "ws://127.0.0.1:%d/api/events/" % server_port
+
+
 def find_unused_port():
     with contextlib.closing(socket.socket()) as sock:
         sock.bind(('127.0.0.1', 0))
@@ -140,6 +140,7 @@ setup(
         "distributed>=2.19.0",
         "click",
         "tornado>=5",
+        "msgpack",
         "matplotlib",
         "pillow",
         "h5py",
@@ -1,5 +1,6 @@
 import asyncio
 
+import msgpack
 import tornado.websocket
 
 from .base import log_message, ResultHandlerMixin
@@ -42,12 +43,27 @@ class ResultEventHandler(ResultHandlerMixin, tornado.websocket.WebSocketHandler)
     def initialize(self, state: SharedState, event_registry: EventRegistry):
         self.event_registry = event_registry
         self.state = state
+        self.use_msgpack = False
 
     def check_origin(self, origin):
         # FIXME: implement this when we want to support CORS later
         return super().check_origin(origin)
 
+    def write_message(self, message, binary=False):
+        # clients that pass `?fmt=msgpack` get the potentially large INITIAL_STATE
+        # messages as binary msgpack frames instead of JSON, no matter where
+        # they are sent from:
+        if (
+            self.use_msgpack
+            and isinstance(message, dict)
+            and message.get("messageType") == "INITIAL_STATE"
+        ):
+            message = msgpack.packb(message, use_bin_type=True)
+            binary = True
+        return super().write_message(message, binary=binary)
+
     async def open(self):
+        self.use_msgpack = self.get_query_argument("fmt", None) == "msgpack"
         self.event_registry.add_handler(self)
         if self.state.executor_state.have_executor():
             await self.state.dataset_state.verify()
@@ -58,8 +74,11 @@ class ResultEventHandler(ResultHandlerMixin, tornado.websocket.WebSocketHandler)
                 compound_analyses=self.state.compound_analysis_state.serialize_all(),
             )
             log_message(msg)
-            # FIXME: don't broadcast, only send to the new connection
-            self.event_registry.broadcast_event(msg)
+            if self.use_msgpack:
+                await self.write_message(msg)
+            else:
+                # FIXME: don't broadcast, only send to the new connection
+                self.event_registry.broadcast_event(msg)
             await self.send_existing_job_results()
 
     def on_close(self):
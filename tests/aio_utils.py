@@ -1,4 +1,3 @@
-import json
 import uuid
 
 from utils import assert_msg
@@ -51,7 +50,7 @@ async def consume_task_results(ws, job_uuid):
     num_followup = 0
     done = False
     while not done:
-        msg = json.loads(await ws.recv())
+        msg = await ws.receive_json()
         if msg['messageType'] == 'TASK_RESULT':
             assert_msg(msg, 'TASK_RESULT')
             assert msg['job'] == job_uuid
@@ -64,7 +63,7 @@ async def consume_task_results(ws, job_uuid):
 
         if 'followup' in msg:
             for i in range(msg['followup']['numMessages']):
-                msg = await ws.recv()
+                msg = await ws.receive_bytes()
                 # followups should be PNG encoded:
                 assert msg[:8] == b'\x89\x50\x4E\x47\x0D\x0A\x1A\x0A'
                 num_followup += 1
@@ -83,7 +82,7 @@ async def create_default_dataset(default_raw, ws, http_client, base_url):
         assert_msg(resp_json, 'CREATE_DATASET')
 
     # same msg via ws:
-    msg = json.loads(await ws.recv())
+    msg = await ws.receive_json()
     assert_msg(msg, 'CREATE_DATASET')
 
     return ds_uuid, ds_url
@@ -112,7 +111,7 @@ async def create_analysis(ws, http_client, base_url, ds_uuid, ca_uuid, details=N
         resp_json = await resp.json()
         assert resp_json['status'] == "ok"
 
-    msg = json.loads(await ws.recv())
+    msg = await ws.receive_json()
     assert_msg(msg, 'ANALYSIS_CREATED')
     assert msg['dataset'] == ds_uuid
     assert msg['analysis'] == analysis_uuid
@@ -152,7 +151,7 @@ async def create_update_compound_analysis(
         resp_json = await resp.json()
         assert resp_json['status'] == "ok"
 
-    msg = json.loads(await ws.recv())
+    msg = await ws.receive_json()
     if creating:
         assert_msg(msg, 'COMPOUND_ANALYSIS_CREATED')
     else:
@@ -178,7 +177,7 @@ async def create_job_for_analysis(ws, http_client, base_url, analysis_uuid):
         resp_json = await resp.json()
         assert resp_json['status'] == "ok"
 
-    msg = json.loads(await ws.recv())
+    msg = await ws.receive_json()
     assert_msg(msg, 'JOB_STARTED')
     assert msg['job'] == job_uuid
     assert msg['analysis'] == analysis_uuid
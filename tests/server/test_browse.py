@@ -26,7 +26,7 @@ async def test_browse_localfs(default_raw, base_url, http_client, local_cluster_
         assert len(listing["files"]) >= 1
         defraw_found = False
         for entry in listing["files"]:
-            assert set(entry.keys()) == set(["name", "size", "ctime", "mtime", "owner"])
+            assert entry.keys() == {"name", "size", "ctime", "mtime", "owner"}
             if entry["name"] == raw_ds_filename:
                 defraw_found = True
             assert defraw_found
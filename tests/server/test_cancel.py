@@ -1,8 +1,6 @@
-import json
 import asyncio
 
 import pytest
-import websockets
 
 from utils import assert_msg
 from aio_utils import (
@@ -30,17 +28,16 @@ def _get_ds_params():
 
 @pytest.mark.asyncio
 async def test_cancel_udf_job(
-    base_url, default_raw, http_client, server_port, shared_state, local_cluster_url
+    base_url, default_raw, http_client, ws_url, shared_state, local_cluster_url
 ):
     await create_connection(base_url, http_client, local_cluster_url)
 
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid = "ae5d23bd-1f2a-4c57-bab2-dfc59a1219f3"
@@ -55,7 +52,7 @@ async def test_cancel_udf_job(
             assert_msg(resp_json, 'CREATE_DATASET')
 
         # same msg via ws:
-        msg = json.loads(await ws.recv())
+        msg = await ws.receive_json()
         assert_msg(msg, 'CREATE_DATASET')
 
         ca_uuid, ca_url = await create_update_compound_analysis(
@@ -80,7 +77,7 @@ async def test_cancel_udf_job(
         done = False
         num_seen = 0
         while not done:
-            msg = json.loads(await ws.recv())
+            msg = await ws.receive_json()
             num_seen += 1
             if msg['messageType'] == 'TASK_RESULT':
                 assert_msg(msg, 'TASK_RESULT')
@@ -95,7 +92,7 @@ async def test_cancel_udf_job(
             if 'followup' in msg:
                 for i in range(msg['followup']['numMessages']):
                     # drain binary messages:
-                    msg = await ws.recv()
+                    msg = await ws.receive_bytes()
 
         assert num_seen < 4
         assert job_uuid not in shared_state.job_state.jobs
@@ -106,7 +103,7 @@ async def test_cancel_udf_job(
         types_seen = []
         msgs = []
         while not done:
-            msg = json.loads(await ws.recv())
+            msg = await ws.receive_json()
             print(msg)
             num_seen += 1
             types_seen.append(msg['messageType'])
@@ -126,7 +123,7 @@ async def test_cancel_udf_job(
             if 'followup' in msg:
                 for i in range(msg['followup']['numMessages']):
                     # drain binary messages:
-                    msg = await ws.recv()
+                    msg = await ws.receive_bytes()
         assert set(types_seen) == {"CANCEL_JOB_DONE"}
         assert num_seen < 4
 
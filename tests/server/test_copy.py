@@ -1,6 +1,4 @@
-import json
 import pytest
-import websockets
 import nbformat as nbf
 
 from utils import assert_msg
@@ -18,7 +16,7 @@ pytestmark = [pytest.mark.functional]
 
 @pytest.mark.asyncio
 async def test_copy_notebook(
-    default_raw, base_url, tmpdir_factory, http_client, server_port, local_cluster_url
+    default_raw, base_url, tmpdir_factory, http_client, ws_url, local_cluster_url
 ):
     datadir = tmpdir_factory.mktemp('test_copy')
 
@@ -27,10 +25,9 @@ async def test_copy_notebook(
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -1,7 +1,4 @@
-import json
-
 import pytest
-import websockets
 
 from utils import assert_msg
 from aio_utils import create_connection
@@ -63,7 +60,7 @@ async def test_load_raw_fail(default_raw, base_url, http_client, local_cluster_u
 
 
 @pytest.mark.asyncio
-async def test_dataset_delete(default_raw, base_url, http_client, server_port, local_cluster_url):
+async def test_dataset_delete(default_raw, base_url, http_client, ws_url, local_cluster_url):
     await create_connection(base_url, http_client, local_cluster_url)
     raw_path = default_raw._path
 
@@ -74,9 +71,8 @@ async def test_dataset_delete(default_raw, base_url, http_client, server_port, l
     ds_data = _get_raw_params(raw_path)
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         async with http_client.put(ds_url, json=ds_data) as resp:
@@ -91,7 +87,7 @@ async def test_dataset_delete(default_raw, base_url, http_client, server_port, l
 
 
 @pytest.mark.asyncio
-async def test_initial_state_after_reconnect(default_raw, base_url, http_client, server_port, local_cluster_url):
+async def test_initial_state_after_reconnect(default_raw, base_url, http_client, ws_url, local_cluster_url):
     await create_connection(base_url, http_client, local_cluster_url)
     raw_path = default_raw._path
 
@@ -102,9 +98,8 @@ async def test_initial_state_after_reconnect(default_raw, base_url, http_client,
     ds_data = _get_raw_params(raw_path)
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         async with http_client.put(ds_url, json=ds_data) as resp:
@@ -112,8 +107,8 @@ async def test_initial_state_after_reconnect(default_raw, base_url, http_client,
             resp_json = await resp.json()
             assert_msg(resp_json, 'CREATE_DATASET')
 
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
         assert initial_msg["jobs"] == []
         assert len(initial_msg["datasets"]) == 1
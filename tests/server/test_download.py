@@ -1,9 +1,7 @@
 import io
-import json
 
 import h5py
 import pytest
-import websockets
 import numpy as np
 import nbformat
 
@@ -21,16 +19,15 @@ pytestmark = [pytest.mark.functional]
 
 
 @pytest.mark.asyncio
-async def test_download_hdf5(default_raw, base_url, http_client, server_port, local_cluster_url):
+async def test_download_hdf5(default_raw, base_url, http_client, ws_url, local_cluster_url):
     await create_connection(base_url, http_client, local_cluster_url)
 
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -91,7 +88,7 @@ async def test_download_hdf5(default_raw, base_url, http_client, server_port, lo
     list(ResultFormatRegistry.get_available_formats().keys())
 )
 async def test_download_other_formats(
-    default_raw, base_url, http_client, server_port, filetype, local_cluster_url
+    default_raw, base_url, http_client, ws_url, filetype, local_cluster_url
 ):
     """
     This test just triggers download with different formats,
@@ -102,10 +99,9 @@ async def test_download_other_formats(
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -154,17 +150,16 @@ async def test_download_other_formats(
 
 @pytest.mark.asyncio
 async def test_download_com(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     await create_connection(base_url, http_client, local_cluster_url)
 
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -216,17 +211,16 @@ async def test_download_com(
 
 @pytest.mark.asyncio
 async def test_download_notebook(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     await create_connection(base_url, http_client, local_cluster_url)
 
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
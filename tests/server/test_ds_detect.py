@@ -1,7 +1,4 @@
-import json
-
 import pytest
-import websockets
 
 from utils import assert_msg
 from aio_utils import create_connection
@@ -11,13 +8,12 @@ pytestmark = [pytest.mark.functional]
 
 @pytest.mark.asyncio
 async def test_detect_failed(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     await create_connection(base_url, http_client, local_cluster_url)
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
         assert initial_msg['datasets'] == []
         assert initial_msg['jobs'] == []
@@ -32,12 +28,11 @@ async def test_detect_failed(
 
 
 @pytest.mark.asyncio
-async def test_detect_hdf5(hdf5, base_url, http_client, server_port, local_cluster_url):
+async def test_detect_hdf5(hdf5, base_url, http_client, ws_url, local_cluster_url):
     await create_connection(base_url, http_client, local_cluster_url)
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
         assert initial_msg['datasets'] == []
         assert initial_msg['jobs'] == []
@@ -1,7 +1,4 @@
-import json
-
 import pytest
-import websockets
 
 from utils import assert_msg
 from aio_utils import (
@@ -14,16 +11,15 @@ pytestmark = [pytest.mark.functional]
 
 
 @pytest.mark.asyncio
-async def test_run_job_1_sum(default_raw, base_url, http_client, server_port, local_cluster_url):
+async def test_run_job_1_sum(default_raw, base_url, http_client, ws_url, local_cluster_url):
     await create_connection(base_url, http_client, scheduler_url=local_cluster_url)
 
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -58,7 +54,7 @@ async def test_run_job_1_sum(default_raw, base_url, http_client, server_port, lo
 
 @pytest.mark.asyncio
 async def test_run_job_delete_ds(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     """
     main difference to test above: we just close the dataset without
@@ -68,10 +64,9 @@ async def test_run_job_delete_ds(
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -101,13 +96,12 @@ async def test_run_job_delete_ds(
 
 @pytest.mark.asyncio
 async def test_cancel_unknown_job(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     await create_connection(base_url, http_client, scheduler_url=local_cluster_url)
 
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         job_uuid = "un-kn-ow-n"
@@ -121,16 +115,15 @@ async def test_cancel_unknown_job(
 
 @pytest.mark.asyncio
 async def test_run_with_all_zeros_roi(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     await create_connection(base_url, http_client, scheduler_url=local_cluster_url)
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -177,16 +170,15 @@ async def test_run_with_all_zeros_roi(
 
 @pytest.mark.asyncio
 async def test_run_job_update_analysis_parameters(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     await create_connection(base_url, http_client, scheduler_url=local_cluster_url)
     print("checkpoint 1")
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -228,7 +220,7 @@ async def test_run_job_update_analysis_parameters(
             resp_json = await resp.json()
             assert resp_json['status'] == "ok"
 
-        msg = json.loads(await ws.recv())
+        msg = await ws.receive_json()
         assert_msg(msg, 'ANALYSIS_UPDATED')
         assert msg['analysis'] == analysis_uuid
         assert msg['details']['parameters'] == {
@@ -260,15 +252,14 @@ async def test_run_job_update_analysis_parameters(
 
 @pytest.mark.asyncio
 async def test_analysis_removal(
-    default_raw, base_url, http_client, server_port, shared_state, local_cluster_url
+    default_raw, base_url, http_client, ws_url, shared_state, local_cluster_url
 ):
     await create_connection(base_url, http_client, scheduler_url=local_cluster_url)
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
@@ -312,9 +303,9 @@ async def test_analysis_removal(
         assert resp.status == 200
         assert_msg(await resp.json(), 'DELETE_DATASET')
 
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
         assert initial_msg == {
             "status": "ok",
@@ -328,15 +319,14 @@ async def test_analysis_removal(
 
 @pytest.mark.asyncio
 async def test_create_compound_analysis(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, ws_url, local_cluster_url
 ):
     await create_connection(base_url, http_client, scheduler_url=local_cluster_url)
 
     # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
+    async with http_client.ws_connect(ws_url) as ws:
         print("checkpoint 2")
-        initial_msg = json.loads(await ws.recv())
+        initial_msg = await ws.receive_json()
         assert_msg(initial_msg, 'INITIAL_STATE')
 
         ds_uuid, ds_url = await create_default_dataset(
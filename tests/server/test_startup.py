@@ -1,7 +1,8 @@
-import json
+import asyncio
 
+import aiohttp
+import msgpack
 import pytest
-import websockets
 
 from utils import assert_msg
 from aio_utils import (
@@ -11,21 +12,56 @@ from aio_utils import (
 pytestmark = [pytest.mark.functional]
 
 
+_RAW_PARAMS = {
+    "type": "RAW",
+    "dtype": "float32",
+    "detector_size": [128, 128],
+    "enable_direct": False,
+    "scan_size": [16, 16]
+}
+
+
+_DS_UUID = "ae5d23bd-1f2a-4c57-bab2-dfc59a1219f3"
+
+_EXPECTED_CONFIG_KEYS = frozenset({"status", "messageType", "config"})
+
+_EXPECTED_CONFIG_INNER = frozenset({
+    "version", "revision", "localCores", "cwd",
+    "separator", "resultFileFormats", "devices",
+})
+
+
 def _get_raw_params(path):
     return {
         "dataset": {
-            "params": {
-                "type": "RAW",
-                "path": path,
-                "dtype": "float32",
-                "detector_size": [128, 128],
-                "enable_direct": False,
-                "scan_size": [16, 16]
-            }
+            "params": {**_RAW_PARAMS, "path": path}
         }
     }
 
 
+async def _create_raw_ds(http_client, base_url, raw_path):
+    ds_url = "{}/api/datasets/{}/".format(
+        base_url, _DS_UUID
+    )
+    ds_params = _get_raw_params(raw_path)
+    async with http_client.put(ds_url, json=ds_params) as resp:
+        assert resp.status == 200
+        resp_json = await resp.json()
+        assert_msg(resp_json, 'CREATE_DATASET')
+        assert ds_params['dataset']['params'].items() <= resp_json['details']['params'].items()
+    return _DS_UUID
+
+
+@pytest.fixture
+async def connected_ws_url(ws_url, base_url, http_client, local_cluster_url):
+    """
+    connect the server to the shared dask cluster and return the URL
+    of the websocket endpoint
+    """
+    await create_connection(base_url, http_client, local_cluster_url)
+    return ws_url
+
+
 @pytest.mark.asyncio
 async def test_start_server(base_url, http_client):
     """
@@ -35,7 +71,6 @@ async def test_start_server(base_url, http_client):
     url = base_url
     async with http_client.get(url) as response:
         assert response.status == 200
-        print(await response.text())
 
 
 @pytest.mark.asyncio
@@ -44,11 +79,8 @@ async def test_get_config(base_url, http_client):
     async with http_client.get(url) as response:
         assert response.status == 200
         config = await response.json()
-        assert set(config.keys()) == set(["status", "messageType", "config"])
-        assert set(config['config'].keys()) == set([
-            "version", "revision", "localCores", "cwd",
-            "separator", "resultFileFormats", "devices",
-        ])
+        assert config.keys() == _EXPECTED_CONFIG_KEYS
+        assert config['config'].keys() == _EXPECTED_CONFIG_INNER
 
 
 @pytest.mark.asyncio
@@ -57,7 +89,6 @@ async def test_conn_is_disconnected(base_url, http_client):
     async with http_client.get(url) as response:
         assert response.status == 200
         conn = await response.json()
-        print(conn)
         assert conn['status'] == 'disconnected'
         assert conn['connection'] == {}
 
@@ -110,23 +141,9 @@ async def test_cluster_connect_error(base_url, http_client):
 
 
 @pytest.mark.asyncio
-async def test_initial_state_empty(
-    default_raw, base_url, http_client, server_port, local_cluster_url
-):
-    conn_url = "{}/api/config/connection/".format(base_url)
-    conn_details = {
-        'connection': {
-            'type': 'tcp',
-            'address': local_cluster_url,
-        }
-    }
-    async with http_client.put(conn_url, json=conn_details) as response:
-        assert response.status == 200
-
-    # connect to ws endpoint:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+async def test_initial_state_empty(http_client, connected_ws_url):
+    async with http_client.ws_connect(connected_ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert initial_msg['messageType'] == "INITIAL_STATE"
         assert initial_msg['status'] == "ok"
         assert initial_msg['datasets'] == []
@@ -135,49 +152,56 @@ async def test_initial_state_empty(
 
 
 @pytest.mark.asyncio
-async def test_initial_state_w_existing_ds(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+async def test_initial_state_msgpack(
+    default_raw, base_url, http_client, connected_ws_url
 ):
-    conn_url = "{}/api/config/connection/".format(base_url)
-    conn_details = {
-        'connection': {
-            'type': 'tcp',
-            'address': local_cluster_url,
-        }
-    }
-    async with http_client.put(conn_url, json=conn_details) as response:
-        assert response.status == 200
+    ds_uuid = await _create_raw_ds(http_client, base_url, default_raw._path)
 
-    # first connect has empty list of datasets:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
-        assert initial_msg['messageType'] == "INITIAL_STATE"
-        assert initial_msg['status'] == "ok"
+    async with http_client.ws_connect(connected_ws_url + "?fmt=msgpack") as ws:
+        initial_msg = msgpack.unpackb(await ws.receive_bytes(), raw=False)
+        assert_msg(initial_msg, 'INITIAL_STATE')
+        assert initial_msg['jobs'] == []
+        assert initial_msg['analyses'] == []
+        assert len(initial_msg['datasets']) == 1
+        assert initial_msg['datasets'][0]["id"] == ds_uuid
+        assert initial_msg['datasets'][0]["params"]["shape"] == [16, 16, 128, 128]
+
+
+@pytest.mark.asyncio
+async def test_initial_state_msgpack_on_connect(
+    base_url, http_client, ws_url, local_cluster_url
+):
+    # no executor yet, so nothing is sent on open; the INITIAL_STATE
+    # broadcast by the connection PUT must be msgpack-encoded, too:
+    async with http_client.ws_connect(ws_url + "?fmt=msgpack") as ws:
+        await create_connection(base_url, http_client, local_cluster_url)
+        msg = await ws.receive()
+        assert msg.type == aiohttp.WSMsgType.BINARY
+        initial_msg = msgpack.unpackb(msg.data, raw=False)
+        assert_msg(initial_msg, 'INITIAL_STATE')
         assert initial_msg['datasets'] == []
 
-    raw_path = default_raw._path
 
-    ds_uuid = "ae5d23bd-1f2a-4c57-bab2-dfc59a1219f3"
-    ds_url = "{}/api/datasets/{}/".format(
-        base_url, ds_uuid
-    )
-    ds_params = _get_raw_params(raw_path)
-    async with http_client.put(ds_url, json=ds_params) as resp:
-        assert resp.status == 200
-        resp_json = await resp.json()
-        assert_msg(resp_json, 'CREATE_DATASET')
-        for k in ds_params['dataset']['params']:
-            assert ds_params['dataset']['params'][k] == resp_json['details']['params'][k]
+@pytest.mark.asyncio
+async def test_create_dataset_pushed_to_open_ws(
+    default_raw, base_url, http_client, connected_ws_url
+):
+    raw_path = default_raw._path
 
-    # second connect has one dataset:
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
-        assert initial_msg['messageType'] == "INITIAL_STATE"
-        assert initial_msg['status'] == "ok"
-        assert len(initial_msg['datasets']) == 1
-        assert initial_msg['datasets'][0]["id"] == ds_uuid
-        assert initial_msg['datasets'][0]["params"] == {
+    async with http_client.ws_connect(connected_ws_url) as ws:
+        initial_msg = await ws.receive_json()
+        assert_msg(initial_msg, 'INITIAL_STATE')
+
+        # create the dataset while the websocket is still open, the same
+        # message is pushed to it:
+        ds_uuid, msg = await asyncio.gather(
+            _create_raw_ds(http_client, base_url, raw_path),
+            ws.receive_json(),
+        )
+        assert_msg(msg, 'CREATE_DATASET')
+        assert msg['dataset'] == ds_uuid
+        assert msg['details']["id"] == ds_uuid
+        assert msg['details']["params"] == {
             "type": "RAW",
             "path": raw_path,
             "dtype": "float32",
@@ -190,57 +214,35 @@ async def test_initial_state_w_existing_ds(
 
 @pytest.mark.asyncio
 async def test_initial_state_analyses(
-    default_raw, base_url, http_client, server_port, local_cluster_url
+    default_raw, base_url, http_client, connected_ws_url
 ):
-    await create_connection(base_url, http_client, local_cluster_url)
+    ds_uuid = await _create_raw_ds(http_client, base_url, default_raw._path)
 
-    # first connect has empty list of datasets:
-    ws_url = "ws://127.0.0.1:{}/api/events/".format(server_port)
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(connected_ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert initial_msg['messageType'] == "INITIAL_STATE"
-        assert initial_msg['status'] == "ok"
-        assert initial_msg['datasets'] == []
-
-    raw_path = default_raw._path
 
-    ds_uuid = "ae5d23bd-1f2a-4c57-bab2-dfc59a1219f3"
-    ds_url = "{}/api/datasets/{}/".format(
-        base_url, ds_uuid
-    )
-    ds_params = _get_raw_params(raw_path)
-    async with http_client.put(ds_url, json=ds_params) as resp:
-        assert resp.status == 200
-        resp_json = await resp.json()
-        assert_msg(resp_json, 'CREATE_DATASET')
-        for k in ds_params['dataset']['params']:
-            assert ds_params['dataset']['params'][k] == resp_json['details']['params'][k]
-
-        async with websockets.connect(ws_url) as ws:
-            initial_msg = json.loads(await ws.recv())
-            assert initial_msg['messageType'] == "INITIAL_STATE"
-
-            ca_uuid, ca_url = await create_update_compound_analysis(
-                ws, http_client, base_url, ds_uuid,
-            )
-
-            analysis_uuid, analysis_url = await create_analysis(
-                ws, http_client, base_url, ds_uuid, ca_uuid, details={
-                    "analysisType": "SUM_FRAMES",
-                    "parameters": {
-                        "roi": {
-                            "shape": "disk",
-                            "r": 1,
-                            "cx": 1,
-                            "cy": 1,
-                            }
+        ca_uuid, ca_url = await create_update_compound_analysis(
+            ws, http_client, base_url, ds_uuid,
+        )
+
+        analysis_uuid, analysis_url = await create_analysis(
+            ws, http_client, base_url, ds_uuid, ca_uuid, details={
+                "analysisType": "SUM_FRAMES",
+                "parameters": {
+                    "roi": {
+                        "shape": "disk",
+                        "r": 1,
+                        "cx": 1,
+                        "cy": 1,
                         }
-                }
-            )
+                    }
+            }
+        )
 
     # second connect has one dataset and one analysis:
-    async with websockets.connect(ws_url) as ws:
-        initial_msg = json.loads(await ws.recv())
+    async with http_client.ws_connect(connected_ws_url) as ws:
+        initial_msg = await ws.receive_json()
         assert initial_msg['messageType'] == "INITIAL_STATE"
         assert initial_msg['status'] == "ok"
         assert len(initial_msg['datasets']) == 1